@@ -1,55 +1,267 @@
 import os
 import re
+import json
 import time
-from typing import List, Dict, Any, Tuple
+import asyncio
+import hashlib
+import tempfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, timezone
 from urllib.parse import urlparse
 
-import requests
-from bs4 import BeautifulSoup
+import aiohttp
+import zstandard
+from aiolimiter import AsyncLimiter
+from lxml import etree
+from lxml import html as lxml_html
 from dotenv import load_dotenv
 from supabase import create_client
 from postgrest.exceptions import APIError
 
 load_dotenv()
 
-SUPABASE_URL = os.environ["SUPABASE_URL"]
-SUPABASE_KEY = os.environ["SUPABASE_SERVICE_ROLE_KEY"]
-supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+_supabase = None
+
+def get_supabase():
+    """
+    Client créé à la demande: les workers de parsing (ProcessPoolExecutor en spawn)
+    ré-importent ce module et n’ont besoin ni de Supabase ni des clés.
+    """
+    global _supabase
+    if _supabase is None:
+        _supabase = create_client(os.environ["SUPABASE_URL"], os.environ["SUPABASE_SERVICE_ROLE_KEY"])
+    return _supabase
 
 HEADERS = {
     "User-Agent": "droitis-ingester/1.0",
     "Accept-Language": "fr-CA,fr;q=0.9,en;q=0.7",
+    # br décodé par aiohttp via le paquet Brotli (Justice Laws le sert, ~4x moins d’octets que gzip)
+    "Accept-Encoding": "br, gzip, deflate",
 }
 
 ONLY_LAW_KEY = os.environ.get("ONLY_LAW_KEY")      # ex: "cpc_qc"
 ONLY_JURISDICTION = os.environ.get("ONLY_JURISDICTION")  # ex: "CA-FED" ou "QC"
 
+FETCH_CONCURRENCY = 8      # requêtes HTTP simultanées (toutes lois confondues)
+HOST_RATE_PER_SEC = 2      # politesse: max 2 requêtes/s par hôte
+
+# Connexions keep-alive réutilisées par la session aiohttp (pool global / par hôte)
+POOL_MAXSIZE = 32
+POOL_PER_HOST = 8
+
+# Retry sur erreurs transitoires (réseau, 502/503/504), backoff exponentiel 0.3s, 0.6s, 1.2s
+FETCH_RETRIES = 3
+RETRY_BACKOFF = 0.3
+RETRY_STATUSES = frozenset((502, 503, 504))
+
+# Cache disque des pages (zstd + ETag/Last-Modified): un re-run ne refait pas le réseau
+INGEST_CACHE_DIR = Path(os.environ.get("INGEST_CACHE_DIR") or Path(__file__).resolve().parents[2] / ".ingest_cache")
+INGEST_CACHE_TTL = int(os.environ.get("INGEST_CACHE_TTL", "86400"))  # secondes sans revalidation
+INGEST_NO_CACHE = os.environ.get("INGEST_NO_CACHE") == "1"
+
 # -----------------------------
 # Common helpers
 # -----------------------------
 
-def fetch_html(url: str) -> str:
-    r = requests.get(url, headers=HEADERS, timeout=90)
-    r.raise_for_status()
-    # Justice Laws est parfois mal “détecté” → force utf-8 si besoin
-    if not r.encoding:
-        r.encoding = "utf-8"
-    return r.text
+_host_limiters: Dict[str, AsyncLimiter] = {}
+
+def host_limiter(url: str) -> AsyncLimiter:
+    """
+    Un rate limiter par hôte (remplace l'ancien time.sleep(0.5) global).
+    """
+    host = (urlparse(url).netloc or "").lower()
+    limiter = _host_limiters.get(host)
+    if limiter is None:
+        limiter = _host_limiters[host] = AsyncLimiter(HOST_RATE_PER_SEC, 1)
+    return limiter
+
+def cache_paths(url: str) -> Tuple[Path, Path]:
+    h = hashlib.md5(url.encode("utf-8")).hexdigest()
+    return INGEST_CACHE_DIR / f"{h}.html.zst", INGEST_CACHE_DIR / f"{h}.json"
+
+def read_cache_meta(url: str) -> Optional[Dict[str, Any]]:
+    body_path, meta_path = cache_paths(url)
+    if not (body_path.is_file() and meta_path.is_file()):
+        return None
+    try:
+        return json.loads(meta_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+def drop_cache(url: str):
+    for path in cache_paths(url):
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+
+def read_cache_body(url: str) -> Optional[bytes]:
+    """
+    None si le corps est illisible (fichier tronqué, zstd corrompu): l’entrée est supprimée
+    et l’appelant refait un GET inconditionnel.
+    """
+    body_path, _ = cache_paths(url)
+    try:
+        return zstandard.ZstdDecompressor().decompress(body_path.read_bytes())
+    except (zstandard.ZstdError, OSError) as e:
+        print(f"[CACHE] {url} illisible ({type(e).__name__}), entrée supprimée")
+        drop_cache(url)
+        return None
+
+def write_atomic(path: Path, data: bytes):
+    # Fichier temporaire + os.replace: un run interrompu ne laisse jamais un fichier à moitié écrit.
+    # Nom unique par écriture: deux fetchs concurrents de la même URL (threads du même process) ne se marchent pas dessus.
+    f = tempfile.NamedTemporaryFile(dir=path.parent, prefix=f"{path.name}.", suffix=".tmp", delete=False)
+    tmp = Path(f.name)
+    try:
+        with f:
+            f.write(data)
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+
+def write_cache(url: str, meta: Dict[str, Any], body: Optional[bytes] = None):
+    """
+    body=None: simple rafraîchissement des métadonnées (après un 304).
+    Corps écrit avant les métadonnées: une meta présente désigne toujours un corps complet.
+    """
+    body_path, meta_path = cache_paths(url)
+    body_path.parent.mkdir(parents=True, exist_ok=True)
+    if body is not None:
+        write_atomic(body_path, zstandard.ZstdCompressor(level=10).compress(body))
+    write_atomic(meta_path, json.dumps(meta).encode("utf-8"))
+
+async def http_get(
+    session: aiohttp.ClientSession, url: str, headers: Dict[str, str], allow_304: bool
+) -> Tuple[Optional[bytes], Optional[Dict[str, Any]]]:
+    """
+    GET avec retries (502/503/504, erreurs réseau, timeouts).
+    Retourne (None, None) sur un 304 si allow_304, sinon (corps, métadonnées de cache).
+    """
+    attempt = 0
+    while True:
+        try:
+            async with host_limiter(url):
+                async with session.get(url, headers=headers) as r:
+                    if r.status == 304 and allow_304:
+                        return None, None
+                    r.raise_for_status()
+                    body = await r.read()
+                    return body, {
+                        "url": url,
+                        "etag": r.headers.get("ETag"),
+                        "last_modified": r.headers.get("Last-Modified"),
+                        # Justice Laws est parfois mal “détecté” → force utf-8 si besoin
+                        "charset": r.charset or "utf-8",
+                    }
+        except (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError,
+                aiohttp.ClientResponseError, asyncio.TimeoutError) as e:
+            retriable = not isinstance(e, aiohttp.ClientResponseError) or e.status in RETRY_STATUSES
+            if not retriable or attempt >= FETCH_RETRIES:
+                raise
+            delay = RETRY_BACKOFF * (2 ** attempt)
+            attempt += 1
+            print(f"[RETRY] {url} ({type(e).__name__}) dans {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+async def fetch_html(session: aiohttp.ClientSession, url: str) -> str:
+    """
+    GET avec cache disque:
+    - entrée plus jeune que INGEST_CACHE_TTL → lue sur disque, aucun appel réseau
+    - sinon GET conditionnel (If-None-Match / If-Modified-Since); 304 → corps lu sur disque
+    - corps en cache illisible → entrée supprimée, GET inconditionnel
+    """
+    meta = None if INGEST_NO_CACHE else await asyncio.to_thread(read_cache_meta, url)
+
+    if meta and time.time() - meta.get("fetched_at", 0) < INGEST_CACHE_TTL:
+        body = await asyncio.to_thread(read_cache_body, url)
+        if body is not None:
+            print(f"[CACHE] {url}")
+            return body.decode(meta.get("charset") or "utf-8", errors="replace")
+        meta = None
+
+    headers = {}
+    if meta and meta.get("etag"):
+        headers["If-None-Match"] = meta["etag"]
+    if meta and meta.get("last_modified"):
+        headers["If-Modified-Since"] = meta["last_modified"]
+
+    body, fresh_meta = await http_get(session, url, headers, allow_304=meta is not None)
+    if body is None:
+        body = await asyncio.to_thread(read_cache_body, url)
+        if body is not None:
+            print(f"[CACHE] {url} (304 Not Modified)")
+            meta["fetched_at"] = time.time()
+            await asyncio.to_thread(write_cache, url, meta)
+            return body.decode(meta.get("charset") or "utf-8", errors="replace")
+        body, fresh_meta = await http_get(session, url, {}, allow_304=False)
+
+    fresh_meta["fetched_at"] = time.time()
+    if not INGEST_NO_CACHE:
+        await asyncio.to_thread(write_cache, url, fresh_meta, body)
+    return body.decode(fresh_meta["charset"], errors="replace")
+
+
+# Balises dont le contenu n’est jamais du texte de loi (scripts, TOC, menus)
+SKIP_TAGS = frozenset(("script", "style", "noscript", "header", "footer", "nav", "aside"))
+
+# Espaces insécables → espace simple (un seul translate sur le texte final)
+NBSP_TABLE = str.maketrans("\xa0", " ")
+
+# Un seul parser lxml réutilisé pour toutes les pages.
+# Les commentaires restent dans l’arbre: itertext() ignore leur texte mais garde
+# séparés les noeuds texte de part et d’autre (comme BeautifulSoup).
+HTML_PARSER = lxml_html.HTMLParser(encoding="utf-8")
+
+def parse_html(html: str):
+    """
+    Parse direct avec lxml (sans l'arbre BeautifulSoup par-dessus).
+    On passe des bytes utf-8 pour ne pas buter sur un <?xml encoding=...?> en tête de page.
+    """
+    if not html or not html.strip():
+        return None
+    try:
+        return lxml_html.document_fromstring(html.encode("utf-8"), parser=HTML_PARSER)
+    except etree.ParserError:
+        # "Document is empty": doctype / commentaires seuls, aucun élément
+        return None
+
+def strip_boilerplate(tree):
+    """
+    Nettoyeur unique des pages: retire SKIP_TAGS et leur contenu (tail conservé).
+    Chaque élément retiré est remplacé par un commentaire vide qui porte son tail: le texte avant et
+    après reste deux noeuds distincts (comme BeautifulSoup et SectionCollector), donc deux lignes.
+    """
+    for el in list(tree.iter(*SKIP_TAGS)):
+        parent = el.getparent()
+        if parent is None:
+            continue
+        marker = etree.Comment("")
+        marker.tail = el.tail
+        parent.replace(el, marker)
+    return tree
 
+def element_text(el) -> str:
+    """
+    Équivalent de BeautifulSoup.get_text("\n", strip=True): un noeud texte non vide par ligne, déjà normalisé.
+    Les parseurs d’articles s’appuient sur les débuts de ligne, donc on garde les "\n".
+    """
+    return "\n".join(s for t in el.itertext() if (s := t.strip())).translate(NBSP_TABLE)
 
-def normalize_text(s: str) -> str:
-    return (s or "").replace("\xa0", " ").strip()
+def find_main(tree):
+    main = tree.find(".//main")
+    return main if main is not None else tree.find("body")
 
 def extract_main_text(html: str) -> str:
-    soup = BeautifulSoup(html, "lxml")
-    for tag in soup(["script", "style", "noscript"]):
-        tag.decompose()
-    for tag in soup.find_all(["header", "footer", "nav", "aside"]):
-        tag.decompose()
-    main = soup.find("main") or soup.body
-    text = main.get_text("\n", strip=True) if main else soup.get_text("\n", strip=True)
-    return normalize_text(text)
+    tree = parse_html(html)
+    if tree is None:
+        return ""
+    main = find_main(strip_boilerplate(tree))
+    return element_text(main if main is not None else tree)
 
 def dedupe_rows(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """
@@ -59,19 +271,21 @@ def dedupe_rows(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     best: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
     for r in rows:
         key = (r["code_id"], r["jurisdiction"], r["citation"])
-        if key not in best or len(r.get("text") or "") > len(best[key].get("text") or ""):
+        cur = best.get(key)  # une seule recherche dans le dict par ligne
+        if cur is None or len(r.get("text") or "") > len(cur.get("text") or ""):
             best[key] = r
     return list(best.values())
 
-def upsert_legal_vectors(rows: List[Dict[str, Any]], batch_size: int = 100):
+def upsert_legal_vectors(rows: List[Dict[str, Any]], batch_size: int = 5000):
+    """
+    Upsert en masse via la RPC ingest_legal_vectors (voir scripts/ingest/sql/ingest_legal_vectors.sql):
+    INSERT ... ON CONFLICT côté Postgres, un aller-retour par lot (= une loi entière en pratique).
+    """
     rows = dedupe_rows(rows)
     for i in range(0, len(rows), batch_size):
         batch = rows[i:i + batch_size]
         try:
-            supabase.table("legal_vectors").upsert(
-                batch,
-                on_conflict="code_id,jurisdiction,citation"
-            ).execute()
+            get_supabase().rpc("ingest_legal_vectors", {"payload": batch}).execute()
         except APIError as e:
             sample = [b.get("citation") for b in batch[:5]]
             raise RuntimeError(
@@ -79,7 +293,7 @@ def upsert_legal_vectors(rows: List[Dict[str, Any]], batch_size: int = 100):
             ) from e
 
 def mark_ingested(law_key: str):
-    supabase.table("law_registry").update({
+    get_supabase().table("law_registry").update({
         "status": "ingested",
         "last_ingested_at": datetime.now(timezone.utc).isoformat(),
     }).eq("law_key", law_key).execute()
@@ -88,33 +302,30 @@ def mark_ingested(law_key: str):
 # QC parser (LegisQuebec)
 # -----------------------------
 
-ARTICLE_RE_QC_DOT = re.compile(r"(?m)^\s*(\d+(?:\.\d+)?)\s*\.\s+")
-ARTICLE_RE_QC_WORD = re.compile(r"(?mi)^\s*Article\s+(\d+(?:\.\d+)?)\s*$")
+# En-tête d’article en un seul scan: "12. ..." (groupe 1) ou ligne "Article 12" (groupe 2)
+ARTICLE_RE_QC = re.compile(r"(?mi)^\s*(?:(\d+(?:\.\d+)?)\s*\.\s+|Article\s+(\d+(?:\.\d+)?)\s*$)")
 
 def parse_legisquebec_articles(html: str, code_id: str, jurisdiction: str, bucket: str) -> List[Dict[str, Any]]:
     text = extract_main_text(html)
 
-    matches = list(ARTICLE_RE_QC_DOT.finditer(text))
-    if not matches:
-        matches = list(ARTICLE_RE_QC_WORD.finditer(text))
-        mode = "word"
-    else:
-        mode = "dot"
-
+    matches = list(ARTICLE_RE_QC.finditer(text))
     if not matches:
         return []
 
+    # Les en-têtes "12." priment (comme avant); les lignes "Article 12" ne servent que s’il n’y en a aucun
+    dot_matches = [m for m in matches if m.group(1)]
+    if dot_matches:
+        matches = dot_matches
+
     rows: List[Dict[str, Any]] = []
     for i, m in enumerate(matches):
-        art_num = m.group(1)
-        start = m.start()
-        end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
-        chunk = text[start:end].strip()
+        art_num = m.group(1) or m.group(2)
+        # L’en-tête ("12." / "Article 12") est déjà consommé par le match: on tranche après
+        body_end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+        if body_end - m.end() < 60:
+            continue  # trop court même avant strip: pas de copie
 
-        if mode == "dot":
-            chunk = re.sub(rf"^\s*{re.escape(art_num)}\s*\.\s+", "", chunk).strip()
-        else:
-            chunk = re.sub(rf"(?im)^\s*Article\s+{re.escape(art_num)}\s*$", "", chunk).strip()
+        chunk = text[m.end():body_end].strip()
 
         if not chunk or len(chunk) < 60:
             continue
@@ -138,17 +349,115 @@ def parse_legisquebec_articles(html: str, code_id: str, jurisdiction: str, bucke
 # Ex: "1 Titre abrégé" / "1 Short title" / "2 Définitions"
 SECTION_RE_TEXT = re.compile(r"(?m)^\s*(\d+(?:\.\d+){0,3})\s+([A-Za-zÉÈÊËÀÂÎÏÔÛÜÇ].+)$")
 
+# Numéro de section en tête du premier noeud texte d’un bloc DOM
+SEC_NUM_RE = re.compile(r"^\s*(\d+(?:\.\d+){0,3})\b")
+
+FULLTEXT_HREF_RE = re.compile(r"(TexteComplet|textecomplet|FullText)\.html")
+
+class SectionCollector:
+    """
+    Cible lxml (parser target): collecte le texte des blocs "section" pendant le parse, sans construire d’arbre.
+    - id commençant par "s-" ou contenant "section", ou class contenant "section"
+    - contenu de SKIP_TAGS ignoré
+    - si la page a un <main>, seuls les blocs dans le premier sont gardés, sinon ceux dans <body> (comme find_main);
+      <main>/<body> eux-mêmes ne sont jamais des blocs (ancien main.find_all(True))
+    close() retourne, pour chaque bloc, la liste de ses noeuds texte (non vides, strip) dans l’ordre du document:
+    le texte n’est assemblé que pour les blocs retenus.
+    """
+
+    def __init__(self):
+        self._blocks: List[Tuple[int, bool, List[str]]] = []   # (n° du <main> englobant ou 0, dans <body>, morceaux)
+        self._open: List[List[str]] = []                        # blocs ouverts (imbriqués)
+        self._stack: List[Tuple[bool, bool, bool, bool]] = []   # par élément: (skip, main, body, bloc)
+        self._skip = 0
+        self._main = 0
+        self._main_no = 0
+        self._body = 0
+        self._saw_main = False
+        self._buf: List[str] = []
+
+    def _flush(self):
+        if not self._buf:
+            return
+        piece = "".join(self._buf).strip()
+        self._buf = []
+        if piece:
+            for pieces in self._open:
+                pieces.append(piece)
+
+    def start(self, tag, attrib):
+        self._flush()
+
+        is_skip = tag in SKIP_TAGS
+        is_main = False
+        is_body = False
+        is_block = False
+
+        if is_skip:
+            self._skip += 1
+        elif not self._skip:
+            if tag == "main":
+                is_main = True
+                if not self._main:
+                    self._main_no += 1
+                self._main += 1
+                self._saw_main = True
+            elif tag == "body":
+                is_body = True
+                self._body += 1
+            else:
+                el_id = (attrib.get("id") or "").lower()
+                el_cls = (attrib.get("class") or "").lower()
+                if ("section" in el_cls) or el_id.startswith("s-") or ("section" in el_id):
+                    is_block = True
+                    pieces: List[str] = []
+                    self._blocks.append((self._main_no if self._main else 0, self._body > 0, pieces))
+                    self._open.append(pieces)
+
+        self._stack.append((is_skip, is_main, is_body, is_block))
+
+    def end(self, tag):
+        self._flush()
+        if not self._stack:
+            return
+
+        is_skip, is_main, is_body, is_block = self._stack.pop()
+        if is_skip:
+            self._skip -= 1
+        if is_main:
+            self._main -= 1
+        if is_body:
+            self._body -= 1
+        if is_block:
+            self._open.pop()
+
+    def data(self, data):
+        if self._open and not self._skip:
+            self._buf.append(data)
+
+    def comment(self, text):
+        # un commentaire coupe le noeud texte (comme BeautifulSoup), sans en faire partie
+        self._flush()
+
+    def close(self) -> List[List[str]]:
+        self._flush()
+        if self._saw_main:
+            return [pieces for main_no, _, pieces in self._blocks if main_no == 1]
+        return [pieces for _, in_body, pieces in self._blocks if in_body]
+
 def _is_justice_laws(url: str) -> bool:
-    host = (urlparse(url).netloc or "").lower()
-    return "laws-lois.justice.gc.ca" in host
+    # l’hôte est toujours suivi d’un "/" dans ces URLs: pas besoin de urlparse
+    return "laws-lois.justice.gc.ca/" in url.lower()
+
 def resolve_justice_laws_fulltext_url(index_html: str, current_url: str) -> str | None:
-    soup = BeautifulSoup(index_html, "lxml")
+    tree = parse_html(index_html)
+    if tree is None:
+        return None
 
     # Cherche un href qui contient TexteComplet.html / textecomplet.html / FullText.html
     candidates = []
-    for a in soup.find_all("a", href=True):
-        href = a["href"]
-        if re.search(r"(TexteComplet|textecomplet|FullText)\.html", href):
+    for href in tree.xpath("//a/@href"):
+        if FULLTEXT_HREF_RE.search(href):
             candidates.append(href)
 
     if not candidates:
@@ -167,56 +476,47 @@ def resolve_justice_laws_fulltext_url(index_html: str, current_url: str) -> str
 def parse_justice_laws_sections(html: str, code_id: str, jurisdiction: str, bucket: str) -> List[Dict[str, Any]]:
     """
     Stratégie robuste:
-    1) Essayer DOM: repérer les blocs de section via des indices (class/id/data) + numéros.
-    2) Si DOM fail: fallback regex sur texte.
+    1) Essayer DOM en streaming: SectionCollector repère les blocs de section (class/id) pendant le parse + numéros.
+    2) Si DOM fail: fallback regex sur texte (seul cas où on construit l’arbre complet).
     """
-    soup = BeautifulSoup(html, "lxml")
-
-    for tag in soup(["script", "style", "noscript"]):
-        tag.decompose()
-
-    # On enlève nav/headers/footers pour éviter TOC et menus
-    for tag in soup.find_all(["header", "footer", "nav", "aside"]):
-        tag.decompose()
-
-    main = soup.find("main") or soup.body
-    if not main:
+    if not html or not html.strip():
         return []
 
     rows: List[Dict[str, Any]] = []
 
-    # ---- (A) DOM-based (flexible)
-    # On cherche des éléments qui ressemblent à une "section":
-    # - id contenant "s-" ou "section"
-    # - ou class contenant "section"
-    candidates = []
-    for el in main.find_all(True):
-        el_id = (el.get("id") or "").lower()
-        el_cls = " ".join(el.get("class") or []).lower()
-        if ("section" in el_cls) or el_id.startswith("s-") or ("section" in el_id):
-            candidates.append(el)
-
-    # On essaye d’extraire un numéro de section depuis le texte du candidat
-    sec_num_re = re.compile(r"^\s*(\d+(?:\.\d+){0,3})\b")
+    # ---- (A) DOM-based (flexible), sans arbre: la mémoire reste proportionnelle aux seuls blocs retenus
+    parser = etree.HTMLParser(target=SectionCollector(), encoding="utf-8")
+    candidates = etree.fromstring(html.encode("utf-8"), parser)
 
+    # On essaye d’extraire un numéro de section depuis le texte du candidat (SEC_NUM_RE)
+    # code_id/jurisdiction sont fixes pour la page: le numéro suffit comme clé
     seen = set()
-    for el in candidates:
-        text = normalize_text(el.get_text("\n", strip=True))
-        if not text or len(text) < 40:
+    for pieces in candidates:
+        if not pieces:
+            continue
+
+        # longueur du texte "\n".join(pieces), sans le construire
+        total_len = sum(map(len, pieces)) + len(pieces) - 1
+        if total_len < 40:
             continue
 
-        m = sec_num_re.match(text)
+        # le numéro est forcément au début du premier noeud texte: inutile de joindre le reste pour le trouver
+        m = SEC_NUM_RE.match(pieces[0])
         if not m:
             continue
 
         sec_num = m.group(1)
-        key = (code_id, jurisdiction, sec_num)
-        if key in seen:
+        if sec_num in seen:
+            continue
+        seen.add(sec_num)
+
+        # Le corps (sans le numéro) ne peut pas dépasser ce qui suit le match: rejet avant de joindre
+        if total_len - m.end() < 60:
             continue
-        seen.add(key)
 
         # Retire juste le numéro au début, mais garde le reste (titre + contenu)
-        body = re.sub(rf"^\s*{re.escape(sec_num)}\b\s*", "", text).strip()
+        pieces[0] = pieces[0][m.end():]
+        body = "\n".join(pieces).strip().translate(NBSP_TABLE)
         if len(body) < 60:
             continue
 
@@ -234,7 +534,15 @@ def parse_justice_laws_sections(html: str, code_id: str, jurisdiction: str, buck
         return dedupe_rows(rows)
 
     # ---- (B) Fallback regex sur texte complet
-    text = normalize_text(main.get_text("\n", strip=True))
+    tree = parse_html(html)
+    if tree is None:
+        return []
+
+    main = find_main(strip_boilerplate(tree))
+    if main is None:
+        return []
+
+    text = element_text(main)
     matches = list(SECTION_RE_TEXT.finditer(text))
     if not matches:
         return []
@@ -242,12 +550,12 @@ def parse_justice_laws_sections(html: str, code_id: str, jurisdiction: str, buck
     rows = []
     for i, m in enumerate(matches):
         sec_num = m.group(1)
-        start = m.start()
-        end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
-        chunk = text[start:end].strip()
+        # Le corps commence au titre (groupe 2): le numéro "X " n’est jamais copié
+        body_end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+        if body_end - m.start(2) < 60:
+            continue  # trop court même avant strip: pas de copie
 
-        # enlève "X " au début
-        chunk = re.sub(rf"^\s*{re.escape(sec_num)}\s+", "", chunk).strip()
+        chunk = text[m.start(2):body_end].strip()
 
         if not chunk or len(chunk) < 60:
             continue
@@ -267,32 +575,99 @@ def parse_justice_laws_sections(html: str, code_id: str, jurisdiction: str, buck
 # Dispatcher
 # -----------------------------
 
-from urllib.parse import urlparse
+def needs_fulltext_resolve(source_url: str, jurisdiction: str) -> bool:
+    """
+    CA-FED: si l’URL n’est pas déjà “textecomplet/page-x/fulltext”, on essaie de résoudre depuis l’index.
+    """
+    if jurisdiction != "CA-FED":
+        return False
+    low = source_url.lower()
+    is_full = ("textecomplet.html" in low) or ("fulltext.html" in low) or ("page-" in low)
+    return ("laws-lois.justice.gc.ca/" in low) and not is_full
+
+async def fetch_law(session: aiohttp.ClientSession, sem: asyncio.Semaphore, url: str, jurisdiction: str) -> str:
+    """
+    Étape réseau: télécharge la page (et, pour Justice Laws, la page TexteComplet résolue).
+    Le parsing est fait ensuite hors de la boucle asyncio.
+    """
+    async with sem:
+        html = await fetch_html(session, url)
+
+        if needs_fulltext_resolve(url, jurisdiction):
+            full_url = resolve_justice_laws_fulltext_url(html, url)
+            if full_url:
+                print(f"[RESOLVE] {url} -> {full_url}")
+                html = await fetch_html(session, full_url)
+
+    return html
 
-def parse_by_jurisdiction(html: str, source_url: str, code_id: str, jurisdiction: str, bucket: str) -> List[Dict[str, Any]]:
+def parse_by_jurisdiction(html: str, code_id: str, jurisdiction: str, bucket: str) -> List[Dict[str, Any]]:
     if jurisdiction == "QC":
         return parse_legisquebec_articles(html, code_id, jurisdiction, bucket)
 
     if jurisdiction == "CA-FED":
-        # Si l’URL n’est pas déjà “textecomplet/page-x/fulltext”, on essaie de résoudre depuis l’index.
-        low = source_url.lower()
-        is_full = ("textecomplet.html" in low) or ("fulltext.html" in low) or ("page-" in low)
-
-        if ("laws-lois.justice.gc.ca" in (urlparse(source_url).netloc or "").lower()) and not is_full:
-            full_url = resolve_justice_laws_fulltext_url(html, source_url)
-            if full_url:
-                print(f"[RESOLVE] {source_url} -> {full_url}")
-                html = fetch_html(full_url)
-                source_url = full_url
-
         return parse_justice_laws_sections(html, code_id, jurisdiction, bucket)
 
     return []
 
+async def fetch_and_parse(
+    session: aiohttp.ClientSession,
+    sem: asyncio.Semaphore,
+    pool: ProcessPoolExecutor,
+    law: Dict[str, Any],
+) -> Tuple[str, List[Dict[str, Any]]]:
+    law_key = law["law_key"]
+    code_id = law["canonical_code_id"]
+    jurisdiction = law.get("jurisdiction") or "QC"
+    bucket = law.get("jurisdiction_bucket") or jurisdiction
+    url = law["source_url"]
+
+    print(f"[FETCH] {law_key} ({code_id}) [{jurisdiction}]")
+    html = await fetch_law(session, sem, url, jurisdiction)
+
+    # lxml + regex = CPU: on parse dans un autre process pendant que le HTTP continue
+    loop = asyncio.get_running_loop()
+    rows = await loop.run_in_executor(pool, parse_by_jurisdiction, html, code_id, jurisdiction, bucket)
+
+    if len(rows) == 0:
+        snippet = extract_main_text(html)[:500].replace("\n", " ")
+        raise RuntimeError(f"Parsed 0 rows for {law_key} ({code_id}) [{jurisdiction}]. Snippet: {snippet}")
+
+    return law_key, rows
+
+async def ingest_laws(laws: List[Dict[str, Any]]):
+    sem = asyncio.Semaphore(FETCH_CONCURRENCY)
+    # Un process de parsing par cœur, mais pas plus que de lois (ONLY_LAW_KEY = 1 seul worker à lancer)
+    parse_workers = max(1, min(len(laws), os.cpu_count() or 1))
+    connector = aiohttp.TCPConnector(limit=POOL_MAXSIZE, limit_per_host=POOL_PER_HOST)
+    timeout = aiohttp.ClientTimeout(total=90)
+
+    async with aiohttp.ClientSession(connector=connector, headers=HEADERS, timeout=timeout) as session:
+        # spawn partout (pas de fork sous Linux): à ce stade asyncio.to_thread et le resolver d’aiohttp
+        # ont déjà lancé des threads, et un fork d’un process multi-thread peut se bloquer
+        mp_context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=parse_workers, mp_context=mp_context) as pool:
+            tasks = [asyncio.create_task(fetch_and_parse(session, sem, pool, law)) for law in laws]
+            try:
+                # Upsert au fil de l’eau, dans l’ordre où les lois finissent d’être parsées
+                for fut in asyncio.as_completed(tasks):
+                    # rows déjà dédoublonnées par le parser (upsert_legal_vectors garde son propre filet)
+                    law_key, rows = await fut
+                    print(f"[PARSE] {law_key}: {len(rows)} chunks (after dedupe)")
+
+                    await asyncio.to_thread(upsert_legal_vectors, rows)
+                    print(f"[UPSERT] {law_key}: ok")
+
+                    await asyncio.to_thread(mark_ingested, law_key)
+                    print(f"[DONE] {law_key}: status=ingested")
+            finally:
+                for t in tasks:
+                    t.cancel()
+
 
 def main():
     q = (
-        supabase.table("law_registry")
+        get_supabase().table("law_registry")
         .select("law_key, canonical_code_id, jurisdiction, jurisdiction_bucket, source_url, status")
         .eq("status", "to_ingest")
     )
@@ -308,36 +683,14 @@ def main():
         print("No laws with status=to_ingest (respecting filters).")
         return
 
+    todo = []
     for law in laws:
-        law_key = law["law_key"]
-        code_id = law["canonical_code_id"]
-        jurisdiction = law.get("jurisdiction") or "QC"
-        bucket = law.get("jurisdiction_bucket") or jurisdiction
-        url = law.get("source_url")
-
-        if not url:
-            print(f"[SKIP] Missing source_url for {law_key}")
+        if not law.get("source_url"):
+            print(f"[SKIP] Missing source_url for {law['law_key']}")
             continue
+        todo.append(law)
 
-        print(f"[FETCH] {law_key} ({code_id}) [{jurisdiction}]")
-        html = fetch_html(url)
-
-        rows = parse_by_jurisdiction(html, url, code_id, jurisdiction, bucket)
-
-        if len(rows) == 0:
-            snippet = extract_main_text(html)[:500].replace("\n", " ")
-            raise RuntimeError(f"Parsed 0 rows for {law_key} ({code_id}) [{jurisdiction}]. Snippet: {snippet}")
-
-        rows = dedupe_rows(rows)
-        print(f"[PARSE] {law_key}: {len(rows)} chunks (after dedupe)")
-
-        upsert_legal_vectors(rows)
-        print(f"[UPSERT] {law_key}: ok")
-
-        mark_ingested(law_key)
-        print(f"[DONE] {law_key}: status=ingested")
-
-        time.sleep(0.5)
+    asyncio.run(ingest_laws(todo))
 
 if __name__ == "__main__":
     main()
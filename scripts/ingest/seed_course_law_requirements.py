@@ -1,11 +1,14 @@
 import os
 import re
-import json
 import argparse
 import unicodedata
+from functools import lru_cache
+from itertools import groupby
+from operator import itemgetter
 from pathlib import Path
 from typing import Dict, Any, List, Tuple, Optional
 
+import orjson
 from dotenv import load_dotenv
 from supabase import create_client
 
@@ -44,23 +47,20 @@ def get_supabase():
 # NORMALIZATION
 # ----------------------------
 
+# Accents combinants (U+0300–U+036F) laissés par NFD: retirés en une passe par str.translate
+ACCENT_TABLE = dict.fromkeys(range(0x300, 0x370))
+
+# Toute suite d'espaces / ponctuation / "_" / "/" / "|" / "-" devient un seul "-"
+# ("a - b" -> "a-b", "droit_civil/2" -> "droit-civil-2")
+COURSE_KEY_SEP_RE = re.compile(r"[\W_]+")
+
+
+@lru_cache(maxsize=4096)
 def normalize_course_key(s: str) -> str:
     if not s:
         return ""
-    s = s.strip().lower()
-
-    # supprime accents
-    s = unicodedata.normalize("NFD", s)
-    s = "".join(ch for ch in s if unicodedata.category(ch) != "Mn")
-
-    # nettoie whitespace + tirets
-    s = s.replace("\n", " ").replace("\r", " ").replace("\t", " ")
-    s = re.sub(r"\s+", " ", s).strip()
-    s = re.sub(r"\s*-\s*", "-", s)  # "a - b" -> "a-b"
-    s = re.sub(r"[_/|]+", "-", s)   # rapproche des slugs
-    s = re.sub(r"[^\w-]", "-", s)   # enlève ponctuation -> "-"
-    s = re.sub(r"-{2,}", "-", s).strip("-")
-    return s
+    s = unicodedata.normalize("NFD", s.lower()).translate(ACCENT_TABLE)
+    return COURSE_KEY_SEP_RE.sub("-", s).strip("-")
 
 
 def normalize_law_key(s: str) -> str:
@@ -162,14 +162,13 @@ def resolve_law(law_key: str, law_map: Dict[str, Dict[str, Any]]) -> Optional[Di
     return None
 
 
-def auto_create_law_registry_row(
-    supabase,
+def build_law_registry_row(
     law_key: str,
     title: Optional[str],
     jurisdiction: Optional[str],
 ) -> Dict[str, Any]:
     """
-    Crée une entrée minimale dans law_registry, pour éviter de SKIP le mapping.
+    Entrée minimale pour law_registry, pour éviter de SKIP le mapping.
     IMPORTANT: canonical_code_id est NOT NULL dans ton schéma => on met une valeur non vide.
     Ici, on met canonical_code_id = law_key (fallback sûr).
     """
@@ -180,7 +179,7 @@ def auto_create_law_registry_row(
     if jur not in ("QC", "CA-FED", "CA", "OTHER"):
         jur = "OTHER"
 
-    row = {
+    return {
         "law_key": lk,
         "canonical_code_id": lk,              # fallback non-null
         "jurisdiction": jur,
@@ -190,14 +189,26 @@ def auto_create_law_registry_row(
         "source_url": None,
     }
 
-    supabase.table("law_registry").upsert(row, on_conflict="law_key").execute()
+
+def auto_create_law_registry_rows(supabase, rows: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Crée toutes les lois manquantes en UN seul upsert (rows uniques par law_key).
+    Retourne law_key -> entrée au format de load_law_registry_map, à fusionner dans law_map.
+    """
+    if not rows:
+        return {}
+
+    supabase.table("law_registry").upsert(rows, on_conflict="law_key").execute()
     return {
-        "law_key": lk,
-        "canonical_code_id": lk,
-        "status": "to_ingest",
-        "jurisdiction": jur,
-        "jurisdiction_bucket": jur,
-        "title": title,
+        r["law_key"]: {
+            "law_key": r["law_key"],
+            "canonical_code_id": r["canonical_code_id"],
+            "status": r["status"],
+            "jurisdiction": r["jurisdiction"],
+            "jurisdiction_bucket": r["jurisdiction_bucket"],
+            "title": r["title"],
+        }
+        for r in rows
     }
 
 
@@ -205,83 +216,77 @@ def auto_create_law_registry_row(
 # MAPPING PARSER
 # ----------------------------
 
-def parse_mapping_file(raw: str) -> Dict[str, Dict[str, Any]]:
+# Format TS-like: un seul scanner (une passe sur le fichier) pour
+# clé de cours, en-tête de tableau required/recommended, notes, objet {...} et fin de tableau
+MAPPING_TOKEN_RE = re.compile(
+    r'"(?P<course>[^"]+)"\s*:\s*\{'
+    r'|\b(?P<kind>required|recommended)"?\s*:\s*\['
+    r'|\bnotes"?\s*:\s*"(?P<notes>[^"]*)"'
+    r'|\{(?P<obj>[^{}]*)\}'
+    r'|(?P<close>\])'
+)
+# Champs d'un objet loi (clé avec ou sans guillemets)
+MAPPING_FIELD_RE = re.compile(r'\b(law_key|title|jurisdiction)"?\s*:\s*"([^"]+)"')
+
+
+def parse_mapping_file(raw_bytes: bytes) -> Dict[str, Dict[str, Any]]:
     """
-    Accepte:
+    Accepte (contenu brut du fichier, en bytes):
     - JSON dict directement
     - ou TS-like: "course_key": { required: [ { law_key: "..." }, ... ], recommended: [...] }
     """
-    raw = raw.strip()
-
-    # 1) JSON direct
+    # 1) JSON direct (orjson lit les bytes utf-8 sans passer par une str)
     try:
-        obj = json.loads(raw)
+        obj = orjson.loads(raw_bytes)
         if isinstance(obj, dict):
             return obj
-    except Exception:
+    except orjson.JSONDecodeError:
         pass
 
     # 2) TS-like minimaliste
+    raw = raw_bytes.decode("utf-8", errors="replace").strip()
     out: Dict[str, Dict[str, Any]] = {}
 
-    course_blocks = list(re.finditer(r'"([^"]+)"\s*:\s*{', raw, flags=re.S))
-    if not course_blocks:
+    # petite machine à états: cours courant / tableau courant
+    course: Optional[Dict[str, Any]] = None
+    kind: Optional[str] = None
+
+    for m in MAPPING_TOKEN_RE.finditer(raw):
+        tok = m.lastgroup
+
+        if tok == "course":
+            course = out[m.group("course")] = {"required": [], "recommended": [], "notes": None}
+            kind = None
+        elif tok == "kind":
+            kind = m.group("kind") if course is not None else None
+        elif tok == "close":
+            kind = None
+        elif tok == "notes":
+            if course is not None and course["notes"] is None:
+                course["notes"] = m.group("notes")
+        elif kind:
+            # objet loi dans un tableau required/recommended (premier champ gagne)
+            fields: Dict[str, str] = {}
+            for k, v in MAPPING_FIELD_RE.findall(m.group("obj")):
+                fields.setdefault(k, v)
+            if "law_key" not in fields:
+                continue
+
+            title = fields.get("title")
+            jurisdiction = fields.get("jurisdiction")
+            course[kind].append({
+                "law_key": fields["law_key"].strip(),
+                "title": title.strip() if title is not None else None,
+                "jurisdiction": jurisdiction.strip() if jurisdiction is not None else None,
+            })
+
+    if not out:
         raise RuntimeError(
             "Mapping file: aucune clé de cours détectée.\n"
             'Format attendu: "course_key": { required: [...], recommended: [...] }\n'
             "Astuce: assure-toi que tes clés de cours sont entre guillemets doubles."
         )
 
-    starts = [(m.group(1), m.start()) for m in course_blocks]
-
-    for idx, (course_key, start_pos) in enumerate(starts):
-        end_pos = starts[idx + 1][1] if idx + 1 < len(starts) else len(raw)
-        block = raw[start_pos:end_pos]
-
-        def extract_array(name: str) -> List[Dict[str, Any]]:
-            m = re.search(rf"{name}\s*:\s*\[(.*?)\]\s*,?", block, flags=re.S)
-            if not m:
-                return []
-            body = m.group(1)
-
-            items: List[Dict[str, Any]] = []
-            for om in re.finditer(r"\{(.*?)\}", body, flags=re.S):
-                obj_txt = om.group(1)
-
-                law_key_m = (
-                    re.search(r'law_key\s*:\s*"([^"]+)"', obj_txt)
-                    or re.search(r'"law_key"\s*:\s*"([^"]+)"', obj_txt)
-                )
-                if not law_key_m:
-                    continue
-
-                title_m = (
-                    re.search(r'title\s*:\s*"([^"]+)"', obj_txt)
-                    or re.search(r'"title"\s*:\s*"([^"]+)"', obj_txt)
-                )
-                jur_m = (
-                    re.search(r'jurisdiction\s*:\s*"([^"]+)"', obj_txt)
-                    or re.search(r'"jurisdiction"\s*:\s*"([^"]+)"', obj_txt)
-                )
-
-                items.append({
-                    "law_key": law_key_m.group(1).strip(),
-                    "title": title_m.group(1).strip() if title_m else None,
-                    "jurisdiction": jur_m.group(1).strip() if jur_m else None,
-                })
-            return items
-
-        notes_m = (
-            re.search(r'notes\s*:\s*"([^"]*)"', block, flags=re.S)
-            or re.search(r'"notes"\s*:\s*"([^"]*)"', block, flags=re.S)
-        )
-
-        out[course_key] = {
-            "required": extract_array("required"),
-            "recommended": extract_array("recommended"),
-            "notes": notes_m.group(1) if notes_m else None,
-        }
-
     return out
 
 
@@ -331,11 +336,14 @@ def build_rows(
     # required gagne sur recommended si conflit dans un même cours
     weight = {"required": 2, "recommended": 1}
 
-    rows_by_pair: Dict[Tuple[str, str], Dict[str, Any]] = {}
     unresolved_courses: List[str] = []
     missing_laws: List[Tuple[str, str]] = []
     created_laws: List[Tuple[str, str]] = []
 
+    # Passe 1 (sans réseau): résout les cours et repère les lois absentes de law_registry
+    resolved_courses: List[Tuple[str, Dict[str, Any]]] = []
+    missing_for_create: Dict[str, Dict[str, Any]] = {}
+
     for course_key_raw, payload in mapping.items():
         ck_raw = (course_key_raw or "").strip()
         # 1) tentative directe
@@ -349,64 +357,85 @@ def build_rows(
             unresolved_courses.append(course_key_raw)
             continue
 
+        resolved_courses.append((course_slug, payload))
+
+        if not auto_create_laws:
+            continue
+
         for req_type in ("required", "recommended"):
-            items = payload.get(req_type) or []
-            for idx, it in enumerate(items, start=1):
+            for it in payload.get(req_type) or []:
                 lk_raw = normalize_law_key(it.get("law_key"))
-                if not lk_raw:
+                if not lk_raw or resolve_law(lk_raw, law_map):
                     continue
 
-                reg = resolve_law(lk_raw, law_map)
-
-                if not reg and auto_create_laws:
-                    # crée dans law_registry et recharge dans map locale
-                    created = auto_create_law_registry_row(
-                        supabase=supabase,
-                        law_key=LAW_KEY_ALIASES.get(lk_raw, lk_raw),
+                lk = normalize_law_key(LAW_KEY_ALIASES.get(lk_raw, lk_raw))
+                if lk not in missing_for_create:
+                    missing_for_create[lk] = build_law_registry_row(
+                        law_key=lk,
                         title=it.get("title"),
                         jurisdiction=it.get("jurisdiction"),
                     )
-                    law_map[created["law_key"]] = created
-                    reg = created
-                    created_laws.append((course_slug, created["law_key"]))
+                    created_laws.append((course_slug, lk))
+
+    # Un seul upsert pour toutes les lois à créer, puis fusion dans la map locale
+    law_map.update(auto_create_law_registry_rows(supabase, list(missing_for_create.values())))
+
+    # Résolution law_key -> law_registry (alias compris) faite une fois par clé distincte
+    resolved_lk = {
+        lk: resolve_law(lk, law_map)
+        for lk in {
+            normalize_law_key(it.get("law_key"))
+            for _, payload in resolved_courses
+            for req_type in ("required", "recommended")
+            for it in payload.get(req_type) or []
+        }
+        if lk
+    }
 
+    # Passe 2 (CPU seulement): une entrée brute par item (course_slug, law_key, -poids, rang, type, reg)
+    flat: List[Tuple[str, str, int, int, str, Dict[str, Any]]] = []
+    for course_slug, payload in resolved_courses:
+        for req_type in ("required", "recommended"):
+            neg_weight = -weight[req_type]
+            for idx, it in enumerate(payload.get(req_type) or [], start=1):
+                lk_raw = normalize_law_key(it.get("law_key"))
+                if not lk_raw:
+                    continue
+
+                reg = resolved_lk[lk_raw]
                 if not reg:
                     missing_laws.append((course_slug, lk_raw))
                     continue
 
-                canonical_code_id = (reg.get("canonical_code_id") or "").strip()
-                if not canonical_code_id:
+                if not (reg.get("canonical_code_id") or "").strip():
                     # sécurité: ne bloque pas tout, mais log
                     missing_laws.append((course_slug, reg["law_key"]))
                     continue
 
-                lr_stat = (reg.get("status") or "").strip()
-                status = "ingested" if lr_stat == "ingested" else "to_ingest"
+                flat.append((course_slug, reg["law_key"], neg_weight, idx, req_type, reg))
+
+    # Tri stable: pour chaque (course_slug, law_key), required > recommended puis meilleur rang (plus petit);
+    # le premier de chaque groupe gagne
+    flat.sort(key=itemgetter(0, 1, 2, 3))
 
-                pair_key = (course_slug, reg["law_key"])
+    rows: List[Dict[str, Any]] = []
+    for _pair, group in groupby(flat, key=itemgetter(0, 1)):
+        course_slug, law_key, _neg_weight, idx, req_type, reg = next(group)
 
-                new_row = {
-                    "course_slug": course_slug,
-                    "law_key": reg["law_key"],
-                    "canonical_code_id": canonical_code_id,
-                    "priority": req_type,             # colonne CHECK required/recommended
-                    "rank": idx,                      # ordre dans la liste
-                    "status": status,                 # to_ingest/ingested
-                    "requirement_type": req_type,     # optionnel mais utile
-                }
+        lr_stat = (reg.get("status") or "").strip()
+        status = "ingested" if lr_stat == "ingested" else "to_ingest"
 
-                existing = rows_by_pair.get(pair_key)
-                if not existing:
-                    rows_by_pair[pair_key] = new_row
-                else:
-                    # required > recommended
-                    if weight[new_row["priority"]] > weight[existing["priority"]]:
-                        rows_by_pair[pair_key] = new_row
-                    # si même type, garde le meilleur rang (plus petit)
-                    elif new_row["priority"] == existing["priority"] and new_row["rank"] < existing["rank"]:
-                        rows_by_pair[pair_key] = new_row
+        rows.append({
+            "course_slug": course_slug,
+            "law_key": law_key,
+            "canonical_code_id": reg["canonical_code_id"].strip(),
+            "priority": req_type,             # colonne CHECK required/recommended
+            "rank": idx,                      # ordre dans la liste
+            "status": status,                 # to_ingest/ingested
+            "requirement_type": req_type,     # optionnel mais utile
+        })
 
-    return list(rows_by_pair.values()), unresolved_courses, missing_laws, created_laws
+    return rows, unresolved_courses, missing_laws, created_laws
 
 
 # ----------------------------
@@ -438,8 +467,7 @@ def main():
         else:
             raise FileNotFoundError(f"Mapping introuvable: {args.mapping} (essayé aussi: {alt})")
 
-    raw = mapping_path.read_text(encoding="utf-8", errors="replace")
-    mapping = parse_mapping_file(raw)
+    mapping = parse_mapping_file(mapping_path.read_bytes())
 
     course_lookup, _existing_slugs = build_course_lookup(supabase)
     law_map = load_law_registry_map(supabase)
@@ -0,0 +1,18 @@
+-- Nombre de chunks legal_vectors par code_id, en une seule requête
+-- (utilisé par scripts/tests/run_golden_course_mapping.py).
+-- Les code_id sans aucune ligne sont simplement absents du résultat.
+
+create or replace function public.count_legal_vectors_by_code(code_ids text[])
+returns table(code_id text, n bigint)
+language sql
+stable
+set search_path = public
+as $$
+  select lv.code_id, count(*) as n
+  from public.legal_vectors lv
+  where lv.code_id = any(code_ids)
+  group by lv.code_id;
+$$;
+
+revoke all on function public.count_legal_vectors_by_code(text[]) from public, anon, authenticated;
+grant execute on function public.count_legal_vectors_by_code(text[]) to service_role;
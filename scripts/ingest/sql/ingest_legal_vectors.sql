@@ -0,0 +1,39 @@
+-- Upsert en masse des chunks de lois (appelé par scripts/ingest/ingest_laws.py).
+-- Un seul aller-retour PostgREST par lot au lieu d'un par tranche de 100 lignes.
+--
+-- payload = tableau JSON de
+--   { code_id, jurisdiction, jurisdiction_bucket, citation, title, text }
+-- déjà dédoublonné sur (code_id, jurisdiction, citation): ON CONFLICT DO UPDATE
+-- refuse de toucher deux fois la même ligne dans un même INSERT.
+
+create or replace function public.ingest_legal_vectors(payload jsonb)
+returns integer
+language plpgsql
+set search_path = public
+as $$
+declare
+  n integer;
+begin
+  insert into public.legal_vectors (code_id, jurisdiction, jurisdiction_bucket, citation, title, text)
+  select t.code_id, t.jurisdiction, t.jurisdiction_bucket, t.citation, t.title, t.text
+  from jsonb_to_recordset(payload) as t(
+    code_id text,
+    jurisdiction text,
+    jurisdiction_bucket text,
+    citation text,
+    title text,
+    text text
+  )
+  on conflict (code_id, jurisdiction, citation) do update
+    set jurisdiction_bucket = excluded.jurisdiction_bucket,
+        title = excluded.title,
+        text = excluded.text;
+
+  get diagnostics n = row_count;
+  return n;
+end;
+$$;
+
+-- service_role seulement (ingestion côté serveur)
+revoke all on function public.ingest_legal_vectors(jsonb) from public, anon, authenticated;
+grant execute on function public.ingest_legal_vectors(jsonb) to service_role;
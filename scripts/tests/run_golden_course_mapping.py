@@ -1,6 +1,9 @@
 import os
-import json
 import sys
+from collections import defaultdict
+from pathlib import Path
+
+import orjson
 from dotenv import load_dotenv
 from supabase import create_client
 
@@ -22,43 +25,52 @@ def main():
         sys.exit(2)
 
     path = sys.argv[1]
-    raw = open(path, "r", encoding="utf-8").read()
-    golden = json.loads(raw)
+    golden = orjson.loads(Path(path).read_bytes())
 
     load_env()
     supabase = get_supabase()
 
     failures = []
 
+    # 1 requête: mappings de tous les cours golden
+    slugs = [g["course_slug"] for g in golden]
+    rows = (
+        supabase.table("course_law_requirements")
+        .select("course_slug, law_key, canonical_code_id")
+        .in_("course_slug", slugs)
+        .execute()
+        .data
+    ) or []
+
+    mapped_by_course = defaultdict(set)
+    for r in rows:
+        if r.get("canonical_code_id"):
+            mapped_by_course[r["course_slug"]].add(r["canonical_code_id"])
+
+    # 1 requête: nombre de lignes legal_vectors par canonical_code_id mappé
+    # (RPC count_legal_vectors_by_code, voir scripts/ingest/sql/)
+    all_codes = sorted(set().union(*mapped_by_course.values()))
+    counts = {}
+    if all_codes:
+        counts = {
+            r["code_id"]: r["n"]
+            for r in (
+                supabase.rpc("count_legal_vectors_by_code", {"code_ids": all_codes}).execute().data or []
+            )
+        }
+
     for g in golden:
         course_slug = g["course_slug"]
         must_have = set(g.get("must_have_code_ids", []))
 
-        # mapped laws for course
-        rows = (
-            supabase.table("course_law_requirements")
-            .select("law_key, canonical_code_id")
-            .eq("course_slug", course_slug)
-            .execute()
-            .data
-        ) or []
-
-        mapped_codes = {r["canonical_code_id"] for r in rows if r.get("canonical_code_id")}
+        mapped_codes = mapped_by_course[course_slug]
         missing_codes = sorted(list(must_have - mapped_codes))
         if missing_codes:
             failures.append(f"[{course_slug}] missing canonical_code_id(s): {missing_codes}")
 
         # check ingested content exists in legal_vectors for each mapped canonical_code_id
         for code_id in sorted(mapped_codes):
-            cnt = (
-                supabase.table("legal_vectors")
-                .select("id", count="exact")
-                .eq("code_id", code_id)
-                .limit(1)
-                .execute()
-                .count
-            )
-            if not cnt or cnt == 0:
+            if not counts.get(code_id):
                 failures.append(f"[{course_slug}] code_id={code_id} has 0 rows in legal_vectors")
 
     if failures:
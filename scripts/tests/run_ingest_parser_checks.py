@@ -0,0 +1,77 @@
+import sys
+from pathlib import Path
+
+# scripts/ingest n'est pas un package: on l'ajoute au path pour importer ingest_laws
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "ingest"))
+
+from ingest_laws import parse_justice_laws_sections, parse_legisquebec_articles  # noqa: E402
+
+LONG = "texte assez long pour dépasser le seuil de soixante caractères d’un article"
+
+# (nom, html, citations attendues)
+QC_PAGES = [
+    (
+        "comment between articles",
+        f"<html><body><main><div>1. {LONG}<!-- x -->2. {LONG}</div></main></body></html>",
+        ["art. 1 T", "art. 2 T"],
+    ),
+    (
+        "script between articles",
+        f"<html><body><main><div>1. {LONG}<script>t()</script>2. {LONG}</div></main></body></html>",
+        ["art. 1 T", "art. 2 T"],
+    ),
+    (
+        "noscript and nav between articles",
+        f"<html><body><main><p>1. {LONG}<noscript>n</noscript>2. {LONG}<nav>menu</nav>3. {LONG}</p></main></body></html>",
+        ["art. 1 T", "art. 2 T", "art. 3 T"],
+    ),
+    ("doctype only", "<!DOCTYPE html>", []),
+    ("comment only", "<!-- vide -->", []),
+]
+
+# Assez de blocs pour rester sur la passe DOM (>= 20 lignes) plutôt que sur le fallback regex
+FED_SECTIONS = "".join(f"<div class='section'><p>{i}.1 {LONG}</p></div>" for i in range(1, 21))
+FED_EXPECTED = [f"s. {i}.1 T" for i in range(1, 21)]
+
+FED_PAGES = [
+    (
+        "main with a section class",
+        f"<html><body><main class='section-main'><p>99.1 {LONG}</p>{FED_SECTIONS}</main></body></html>",
+        FED_EXPECTED,
+    ),
+    (
+        "no main, section block in head",
+        f"<html><head><title id='section-titre'>98.1 {LONG}</title></head><body>{FED_SECTIONS}</body></html>",
+        FED_EXPECTED,
+    ),
+    (
+        "second main",
+        f"<html><body><main>{FED_SECTIONS}</main><main><div class='section'>97.1 {LONG}</div></main></body></html>",
+        FED_EXPECTED,
+    ),
+]
+
+def main():
+    failures = []
+
+    for name, html, expected in QC_PAGES:
+        got = [r["citation"] for r in parse_legisquebec_articles(html, "T", "QC", "QC")]
+        if sorted(got) != sorted(expected):
+            failures.append(f"[qc: {name}] expected {expected}, got {got}")
+
+    for name, html, expected in FED_PAGES:
+        got = [r["citation"] for r in parse_justice_laws_sections(html, "T", "CA-FED", "CA-FED")]
+        if sorted(got) != sorted(expected):
+            failures.append(f"[fed: {name}] expected {expected}, got {got}")
+
+    if failures:
+        print("\n[FAILED] Ingest parser checks failed:")
+        for f in failures:
+            print(" -", f)
+        sys.exit(1)
+
+    print("[OK] Ingest parser checks passed.")
+    sys.exit(0)
+
+if __name__ == "__main__":
+    main()